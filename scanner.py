@@ -6,43 +6,68 @@ Python implementation with identical functionality to the C# version
 
 import argparse
 import asyncio
+import json
+import operator
 import os
+import shlex
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
-async def main():
-    """Main entry point"""
+# NAPS2 console executable, resolved to an absolute path by find_naps2()
+NAPS2_EXECUTABLE = "NAPS2.Console"
+
+# Device list cache (scanners rarely change between runs)
+DEVICE_CACHE_FILE = Path(tempfile.gettempdir()) / "naps2_wrapper_devices.json"
+DEVICE_CACHE_TTL = 120  # seconds
+
+# NAPS2 output fragments reporting an empty document feeder (lowercase)
+EMPTY_FEEDER_MESSAGES = (b"no pages are in the feeder", b"no pages in the feeder", b"feeder is empty")
+
+# Keep NAPS2 calls from opening a console window on Windows
+CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+# Buffer limit and read size for the scan output pipes
+STREAM_LIMIT = 1 << 20
+
+
+async def main() -> Tuple[bool, bool]:
+    """
+    Main entry point
+    
+    Returns:
+        Tuple of (scan succeeded, console should wait for Enter before exiting)
+    """
     parser = create_argument_parser()
     args = parser.parse_args()
     
-    if args.help:
-        parser.print_help()
-        return
-    
-    print("=== MODERN SCANNER WRAPPER ===")
-    print(f"Output: {args.output}")
-    print(f"Prefix: {args.prefix}")
-    print(f"Format: {args.format}")
-    print(f"DPI: {args.dpi}")
-    print(f"Color: {args.color}")
-    print(f"Source: {args.source}")
-    print(f"Device: {args.device or 'auto-detect'}")
-    print(f"Driver: {args.driver}")
-    print()
+    banner = "\n".join([
+        "=== MODERN SCANNER WRAPPER ===",
+        f"Output: {args.output}",
+        f"Prefix: {args.prefix}",
+        f"Format: {args.format}",
+        f"DPI: {args.dpi}",
+        f"Color: {args.color}",
+        f"Source: {args.source}",
+        f"Device: {args.device or 'auto-detect'}",
+        f"Driver: {args.driver}",
+    ])
+    sys.stdout.write(banner + "\n\n")
     
     # Execute scan
     success = await scan_with_naps2(
         args.output, args.prefix, args.format, args.dpi,
-        args.color, args.source, args.device, args.driver
+        args.color, args.source, args.device, args.driver,
+        args.refresh_devices
     )
     
     print("✓ Scan completed successfully!" if success else "✗ Scan failed.")
-    print("\nPress Enter to exit...")
-    input()
+    return success, not args.no_pause
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -63,6 +88,9 @@ EXAMPLES:
 
   python scanner.py --driver twain --format pdf --dpi 300
     Use TWAIN driver, save as PDF
+
+  python scanner.py --no-pause
+    Exit immediately when done (for scripts and scheduled tasks)
         """
     )
     
@@ -87,7 +115,7 @@ EXAMPLES:
     
     parser.add_argument(
         "-d", "--dpi",
-        type=int,
+        type=positive_int,
         default=300,
         help="DPI resolution (default: 300)"
     )
@@ -118,9 +146,57 @@ EXAMPLES:
         help="Scanner driver (default: wia)"
     )
     
+    parser.add_argument(
+        "--refresh-devices",
+        action="store_true",
+        help="Ignore the cached device list and query NAPS2 again"
+    )
+    
+    parser.add_argument(
+        "--no-pause",
+        action="store_true",
+        help="Exit without waiting for Enter"
+    )
+    
     return parser
 
 
+def positive_int(value: str) -> int:
+    """
+    Parses a strictly positive integer command line value
+    
+    Args:
+        value: Raw argument value
+    
+    Returns:
+        Parsed integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
+def format_command(arguments: List[str]) -> str:
+    """
+    Formats a command line for display: cmd.exe quoting on Windows (not
+    PowerShell, where a quoted path needs '&' and $(...) is expanded),
+    POSIX shell quoting elsewhere
+    
+    Args:
+        arguments: Command and arguments
+    
+    Returns:
+        Quoted command line
+    """
+    if sys.platform == "win32":
+        return subprocess.list2cmdline(arguments)
+    return shlex.join(arguments)
+
+
 async def scan_with_naps2(
     output_folder: str,
     file_prefix: str,
@@ -129,7 +205,8 @@ async def scan_with_naps2(
     color_mode: str,
     source: str,
     device_name: Optional[str],
-    driver: str
+    driver: str,
+    refresh_devices: bool = False
 ) -> bool:
     """
     Executes scan using NAPS2
@@ -143,26 +220,26 @@ async def scan_with_naps2(
         source: Source (feeder, glass)
         device_name: Scanner device name (None for auto-detect)
         driver: Driver type (wia, twain)
+        refresh_devices: Bypass the cached device list
     
     Returns:
         True if scan succeeded
     """
     try:
-        # Create output folder if it doesn't exist
-        Path(output_folder).mkdir(parents=True, exist_ok=True)
-        if not Path(output_folder).exists():
-            print(f"Created folder: {output_folder}")
-        
         # Check if NAPS2 is available in PATH
-        if not await is_naps2_available():
-            print("ERROR: NAPS2.Console not found in system PATH.")
-            print("Install NAPS2 from: https://www.naps2.com/download")
-            print("Or add NAPS2 installation folder to PATH environment variable.")
+        naps2_path = find_naps2()
+        if naps2_path is None:
+            print_naps2_not_found()
             return False
         
+        # Create output folder if it doesn't exist
+        folder_path = Path(output_folder)
+        folder_path.mkdir(parents=True, exist_ok=True)
+        
         # Find scanner device if not specified
-        if device_name is None:
-            device_name = await get_scanner_device(driver)
+        auto_detected = device_name is None
+        if auto_detected:
+            device_name = get_scanner_device(naps2_path, driver, refresh_devices)
             if not device_name:
                 print("ERROR: No scanner found.")
                 return False
@@ -171,13 +248,13 @@ async def scan_with_naps2(
         
         # Build output path
         if file_format.lower() == "pdf":
-            output_path = Path(output_folder) / f"{file_prefix}.{file_format}"
+            output_path = folder_path / f"{file_prefix}.{file_format}"
         else:
-            output_path = Path(output_folder) / f"{file_prefix}_$(nnnn).{file_format}"
+            output_path = folder_path / f"{file_prefix}_$(nnnn).{file_format}"
         
         # Build NAPS2 command arguments
         arguments = [
-            "NAPS2.Console",
+            naps2_path,
             "--driver", driver,
             "--device", device_name,
             "--source", source,
@@ -187,29 +264,65 @@ async def scan_with_naps2(
             "--verbose"
         ]
         
-        print()
-        print("NAPS2 Command:")
-        print(" ".join(arguments))
-        print()
-        print("Starting scan...")
-        print("MAKE SURE PAPER IS IN THE ADF TRAY!")
-        print()
+        sys.stdout.write(
+            "\nNAPS2 Command:\n"
+            f"{format_command(arguments)}\n\n"
+            "Starting scan...\n"
+            "MAKE SURE PAPER IS IN THE ADF TRAY!\n\n"
+        )
+        
+        # Pick the output writer before NAPS2 starts: raw bytes to the
+        # underlying buffer when there is one, otherwise decode each batch
+        # once for text-only streams (IDLE, redirected or wrapped stdout)
+        stdout_buffer = getattr(sys.stdout, "buffer", None)
+        if stdout_buffer is not None:
+            def emit(data: bytes) -> None:
+                stdout_buffer.write(data)
+                stdout_buffer.flush()
+        else:
+            def emit(data: bytes) -> None:
+                sys.stdout.write(data.decode(errors="replace"))
+                sys.stdout.flush()
+        
+        # Flush pending text output before writing to the byte stream
+        sys.stdout.flush()
         
         # Execute NAPS2
-        process = await asyncio.create_subprocess_exec(
-            *arguments,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *arguments,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT,
+                creationflags=CREATION_FLAGS
+            )
+        except FileNotFoundError:
+            # NAPS2.Console was removed or moved after the PATH lookup
+            print_naps2_not_found()
+            return False
+        
+        # Handle output in real-time, draining the pipe in bulk chunks
+        # and writing whole batches of lines at once
+        feeder_empty = False
         
-        # Handle output in real-time
         async def read_output(stream, prefix):
+            nonlocal feeder_empty
+            tag = f"{prefix}: ".encode()
+            tail = b""
             while True:
-                line = await stream.readline()
-                if not line:
+                chunk = await stream.read(STREAM_LIMIT)
+                if not chunk:
                     break
-                print(f"{prefix}: {line.decode().strip()}")
-        
+                lines = (tail + chunk).split(b"\n")
+                tail = lines.pop()
+                if lines:
+                    batch = b"".join(tag + line.strip() + b"\n" for line in lines)
+                    emit(batch)
+                    feeder_empty = feeder_empty or reports_empty_feeder(batch)
+            if tail:
+                emit(tag + tail.strip() + b"\n")
+                feeder_empty = feeder_empty or reports_empty_feeder(tail)
+
         # Start reading output streams
         await asyncio.gather(
             read_output(process.stdout, "NAPS2"),
@@ -223,13 +336,19 @@ async def scan_with_naps2(
         print(f"NAPS2 finished with exit code: {exit_code}")
         
         # Check if files were created (more reliable than exit code)
-        has_files = check_for_scanned_files(output_folder, file_prefix, file_format)
+        files = find_scanned_files(folder_path, file_prefix, file_format)
         
-        if has_files or exit_code == 0:
-            show_scan_results(output_folder, file_prefix, file_format)
+        if files or exit_code == 0:
+            show_scan_results(folder_path, files)
             return True
         
         print("No files were created.")
+        
+        # Unless NAPS2 just found the feeder empty (the usual "load paper and
+        # retry" case), the detected device may be stale (unplugged or
+        # renamed), so make the next run enumerate devices again
+        if auto_detected and not feeder_empty:
+            save_cached_device(driver, None)
         return False
         
     except Exception as e:
@@ -237,100 +356,176 @@ async def scan_with_naps2(
         return False
 
 
-async def is_naps2_available() -> bool:
+def find_naps2() -> Optional[str]:
     """
-    Checks if NAPS2.Console is available in system PATH
+    Locates NAPS2.Console in system PATH
     
     Returns:
-        True if NAPS2 is available
+        Absolute path to NAPS2.Console or None if not found
     """
-    try:
-        process = await asyncio.create_subprocess_exec(
-            "NAPS2.Console", "--version",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        exit_code = await process.wait()
-        return exit_code == 0
-    except (FileNotFoundError, OSError):
-        return False
+    return shutil.which(NAPS2_EXECUTABLE)
+
 
+def print_naps2_not_found() -> None:
+    """Prints installation instructions for a missing NAPS2.Console"""
+    print("ERROR: NAPS2.Console not found in system PATH.")
+    print("Install NAPS2 from: https://www.naps2.com/download")
+    print("Or add NAPS2 installation folder to PATH environment variable.")
 
-async def get_scanner_device(driver: str) -> Optional[str]:
+
+def get_scanner_device(naps2_path: str, driver: str, refresh: bool = False) -> Optional[str]:
     """
-    Gets available scanner device
+    Gets available scanner device, using the on-disk cache when fresh
     
     Args:
+        naps2_path: Path to NAPS2.Console
         driver: Driver type (wia, twain)
+        refresh: Ignore the cache and query NAPS2 again
     
     Returns:
         Scanner device name or None if not found
     """
+    if not refresh:
+        cached = load_cached_device(driver)
+        if cached:
+            return cached
+    
     try:
-        process = await asyncio.create_subprocess_exec(
-            "NAPS2.Console", "--driver", driver, "--listdevices",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+        result = subprocess.run(
+            [naps2_path, "--driver", driver, "--listdevices"],
+            capture_output=True,
+            timeout=30,
+            creationflags=CREATION_FLAGS
         )
-        
-        stdout, stderr = await process.communicate()
-        exit_code = await process.wait()
-        
-        if exit_code == 0 and stdout:
-            output = stdout.decode().strip()
-            if output:
-                return output.split('\n')[0].strip()
-                
     except Exception as e:
         print(f"Error finding scanner: {e}")
+        return None
+    
+    if result.returncode == 0 and result.stdout:
+        output = result.stdout.decode(errors="replace").strip()
+        if output:
+            device = output.split('\n')[0].strip()
+            save_cached_device(driver, device)
+            return device
     
     return None
 
 
-def check_for_scanned_files(output_folder: str, file_prefix: str, file_format: str) -> bool:
+def load_cached_device(driver: str) -> Optional[str]:
     """
-    Checks if scanned files exist in the output folder
+    Reads a device name from the cache if it is still within the TTL
     
     Args:
-        output_folder: Output folder path
-        file_prefix: File prefix to search for
-        file_format: File format extension
+        driver: Driver type (wia, twain)
     
     Returns:
-        True if files were found
+        Cached device name or None if missing or expired
     """
     try:
-        folder_path = Path(output_folder)
-        if not folder_path.exists():
-            return False
-        
-        search_pattern = f"{file_prefix}*.{file_format}"
-        files = list(folder_path.glob(search_pattern))
+        with open(DEVICE_CACHE_FILE, encoding="utf-8") as f:
+            entry = json.load(f).get(driver)
+        # A timestamp in the future (clock change, bad file) is not fresh
+        if entry and 0 <= time.time() - entry["ts"] < DEVICE_CACHE_TTL:
+            device = entry.get("device")
+            if isinstance(device, str):
+                return device
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    
+    return None
+
+
+def save_cached_device(driver: str, device: Optional[str]) -> None:
+    """
+    Stores a device name in the cache, replacing the file atomically
+    
+    Args:
+        driver: Driver type (wia, twain)
+        device: Scanner device name (None to drop the cached entry)
+    """
+    try:
+        try:
+            with open(DEVICE_CACHE_FILE, encoding="utf-8") as f:
+                cache = json.load(f)
+            if not isinstance(cache, dict):
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
         
-        return len(files) > 0
+        if device is None:
+            if cache.pop(driver, None) is None:
+                return
+        else:
+            cache[driver] = {"device": device, "ts": time.time()}
         
+        fd, tmp_path = tempfile.mkstemp(dir=DEVICE_CACHE_FILE.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, DEVICE_CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+            
+    except OSError:
+        # Caching is best effort; the next run will simply query again
+        pass
+
+
+def reports_empty_feeder(output: bytes) -> bool:
+    """
+    Checks if NAPS2 output reports that the document feeder had no paper
+    
+    Args:
+        output: Raw NAPS2 output
+    
+    Returns:
+        True if an empty feeder message was found
+    """
+    text = output.lower()
+    return any(message in text for message in EMPTY_FEEDER_MESSAGES)
+
+
+def find_scanned_files(folder_path: Path, file_prefix: str, file_format: str) -> List[Tuple[str, int]]:
+    """
+    Finds scanned files in the output folder
+    
+    Args:
+        folder_path: Output folder path
+        file_prefix: File prefix to search for
+        file_format: File format extension
+    
+    Returns:
+        Sorted list of (file name, size in bytes) tuples (empty if none were found)
+    """
+    try:
+        suffix = f".{file_format}"
+        with os.scandir(folder_path) as entries:
+            files = [
+                (entry.name, entry.stat().st_size)
+                for entry in entries
+                if entry.name.startswith(file_prefix)
+                and entry.name.endswith(suffix)
+                and entry.is_file()
+            ]
+        files.sort(key=operator.itemgetter(0))
+        return files
     except Exception:
-        return False
+        return []
 
 
-def show_scan_results(output_folder: str, file_prefix: str, file_format: str) -> None:
+def show_scan_results(folder_path: Path, files: List[Tuple[str, int]]) -> None:
     """
     Shows scan results summary
     
     Args:
-        output_folder: Output folder path
-        file_prefix: File prefix
-        file_format: File format
+        folder_path: Output folder path
+        files: Scanned files as (file name, size in bytes) tuples
     """
     try:
-        folder_path = Path(output_folder)
-        search_pattern = f"{file_prefix}*.{file_format}"
-        files = list(folder_path.glob(search_pattern))
-        
         print(f"\nFiles created ({len(files)}):")
-        for file_path in sorted(files):
-            size_kb = file_path.stat().st_size // 1024
-            print(f"  {file_path.name} ({size_kb:,} KB)")
+        for name, size in files:
+            print(f"  {name} ({size // 1024:,} KB)")
         
         if files:
             print(f"\nAll files saved to: {folder_path.absolute()}")
@@ -342,10 +537,17 @@ def show_scan_results(output_folder: str, file_prefix: str, file_format: str) ->
 if __name__ == "__main__":
     # Handle KeyboardInterrupt gracefully
     try:
-        asyncio.run(main())
+        success, pause = asyncio.run(main())
+        
+        # Wait for Enter only after the event loop and NAPS2 pipes are closed
+        if pause and sys.stdin.isatty() and sys.stdout.isatty():
+            print("\nPress Enter to exit...")
+            input()
     except KeyboardInterrupt:
         print("\n\nScan interrupted by user.")
         sys.exit(1)
     except Exception as e:
         print(f"\nUnexpected error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    
+    sys.exit(0 if success else 1)
\ No newline at end of file